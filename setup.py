@@ -8,7 +8,7 @@ with open("README.rst") as readme_file:
 with open("HISTORY.rst") as history_file:
     history = history_file.read()
 
-requirements = ["iso8601", "requests>=1,<3", "htimeseries>=7,<8"]
+requirements = ["iso8601", "requests>=2.27,<3", "htimeseries>=7,<8"]
 
 setup_requirements = []
 
@@ -31,6 +31,7 @@ setup(
     ],
     description="Python API client for Enhydris",
     install_requires=requirements,
+    extras_require={"orjson": ["orjson"]},
     license="GNU General Public License v3",
     long_description=readme + "\n\n" + history,
     long_description_content_type="text/x-rst",
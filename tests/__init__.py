@@ -1,5 +1,4 @@
 import datetime as dt
-import textwrap
 from copy import copy
 from io import StringIO
 from unittest import mock
@@ -8,27 +7,27 @@ import pandas as pd
 import requests
 from htimeseries import HTimeseries
 
-test_timeseries_csv = textwrap.dedent(
-    """\
-    2014-01-01 08:00,11.0,
-    2014-01-02 08:00,12.0,
-    2014-01-03 08:00,13.0,
-    2014-01-04 08:00,14.0,
-    2014-01-05 08:00,15.0,
-    """
+test_timeseries_csv = (
+    "2014-01-01 08:00,11.0,\n"
+    "2014-01-02 08:00,12.0,\n"
+    "2014-01-03 08:00,13.0,\n"
+    "2014-01-04 08:00,14.0,\n"
+    "2014-01-05 08:00,15.0,\n"
 )
 test_timeseries_htimeseries = HTimeseries(
     StringIO(test_timeseries_csv), default_tzinfo=dt.timezone(dt.timedelta(hours=2))
 )
-test_timeseries_csv_top = "".join(test_timeseries_csv.splitlines(keepends=True)[:-1])
-test_timeseries_csv_bottom = test_timeseries_csv.splitlines(keepends=True)[-1]
+_last_line_start = test_timeseries_csv.rstrip("\n").rfind("\n") + 1
+test_timeseries_csv_top = test_timeseries_csv[:_last_line_start]
+test_timeseries_csv_bottom = test_timeseries_csv[_last_line_start:]
+del _last_line_start
 
 
-def mock_session(**kwargs):
+def mock_session(new_callable=mock.Mock, **kwargs):
     """Mock requests.Session.
 
     Returns
-        @mock.patch("requests.Session", modified_kwargs)
+        @mock.patch("requests.Session", new_callable=new_callable, modified_kwargs)
 
     However, it first tampers with kwargs in order to achieve the following:
     - It adds a leading "return_value." to the kwargs; so you don't need to specify,
@@ -37,6 +36,10 @@ def mock_session(**kwargs):
       a return code of 200. Likewise for post, put and patch. For delete it's 204.
     - If "get.return_value.status_code" is not between 200 and 399,
       then raise_for_status() will raise HTTPError. Likewise for the other methods.
+
+    The session is a plain Mock by default, since the client doesn't use magic
+    methods on it; pass new_callable=mock.MagicMock when a test needs them (e.g.
+    when the client is used as a context manager).
     """
     for method in ("get", "post", "put", "patch", "delete"):
         default_value = 204 if method == "delete" else 200
@@ -46,7 +49,7 @@ def mock_session(**kwargs):
             kwargs[method_side_effect] = requests.HTTPError
     for old_key in list(kwargs.keys()):
         kwargs["return_value." + old_key] = kwargs.pop(old_key)
-    return mock.patch("requests.Session", **kwargs)
+    return mock.patch("requests.Session", new_callable=new_callable, **kwargs)
 
 
 class AssertFrameEqualMixin:
@@ -1,32 +1,39 @@
-from unittest import TestCase, mock
+import importlib
+import json
+import sys
+from unittest import TestCase, mock, skipUnless
 
 import requests
 from htimeseries import HTimeseries
 
+import enhydris_api_client
 from enhydris_api_client import EnhydrisApiClient
 
 from . import mock_session
 
 
 class GetTokenTestCase(TestCase):
-    @mock_session(
-        **{
-            "get.return_value.cookies": {"csrftoken": "reallysecret"},
-            "post.return_value.cookies": {"acookie": "a cookie value"},
-        }
-    )
+    @mock_session(**{"post.return_value.content": b'{"key": "a token"}'})
     def setUp(self, mock_requests_session):
         self.mock_requests_session = mock_requests_session
         self.client = EnhydrisApiClient("https://mydomain.com")
-        self.client.get_token("admin", "topsecret")
+        self.token = self.client.get_token("admin", "topsecret")
 
     def test_makes_post_request(self):
         self.mock_requests_session.return_value.post.assert_called_once_with(
             "https://mydomain.com/api/auth/login/",
-            data="username=admin&password=topsecret",
+            data={"username": "admin", "password": "topsecret"},
             allow_redirects=False,
         )
 
+    def test_returns_token(self):
+        self.assertEqual(self.token, "a token")
+
+    def test_uses_token_in_subsequent_requests(self):
+        self.mock_requests_session.return_value.headers.update.assert_called_with(
+            {"Authorization": "token a token"}
+        )
+
 
 class GetTokenFailTestCase(TestCase):
     @mock_session(**{"post.return_value.status_code": 404})
@@ -38,20 +45,16 @@ class GetTokenFailTestCase(TestCase):
 
 class GetTokenEmptyUsernameTestCase(TestCase):
     @mock_session()
-    def setUp(self, mock_requests_session):
-        self.mock_requests_session = mock_requests_session
-        self.client = EnhydrisApiClient("https://mydomain.com")
-        self.client.get_token("", "useless_password")
-
-    def test_does_not_make_get_request(self):
-        self.mock_requests_session.get.assert_not_called()
-
-    def test_does_not_make_post_request(self):
-        self.mock_requests_session.post.assert_not_called()
+    def test_does_not_make_request(self, mock_requests_session):
+        client = EnhydrisApiClient("https://mydomain.com")
+        result = client.get_token("", "useless_password")
+        mock_requests_session.return_value.get.assert_not_called()
+        mock_requests_session.return_value.post.assert_not_called()
+        self.assertIsNone(result)
 
 
 class UseAsContextManagerTestCase(TestCase):
-    @mock_session()
+    @mock_session(new_callable=mock.MagicMock, **{"get.return_value.content": b"{}"})
     def setUp(self, mock_requests_session):
         self.mock_requests_session = mock_requests_session
         with EnhydrisApiClient("https://mydomain.com/") as api_client:
@@ -71,6 +74,75 @@ class UseAsContextManagerTestCase(TestCase):
         )
 
 
+class PatchClientMethodTestCase(TestCase):
+    @mock_session()
+    def test_can_patch_method_on_instance(self, mock_requests_session):
+        client = EnhydrisApiClient("https://mydomain.com")
+        with mock.patch.object(client, "get_station", return_value={"id": 42}):
+            self.assertEqual(client.get_station(42), {"id": 42})
+
+
+class BaseUrlWithPathTestCase(TestCase):
+    @mock_session(**{"get.return_value.content": b"{}"})
+    def test_makes_request_relative_to_base_url(self, mock_requests_session):
+        client = EnhydrisApiClient("https://mydomain.com/enhydris/")
+        client.get_station(42)
+        mock_requests_session.return_value.get.assert_called_once_with(
+            "https://mydomain.com/enhydris/api/stations/42/"
+        )
+
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class JsonResponseTestCase(TestCase):
+    def _get_station(self, content, module=enhydris_api_client):
+        with mock_session(**{"get.return_value.content": content}):
+            return module.EnhydrisApiClient("https://mydomain.com").get_station(42)
+
+    def test_raises_request_exception_on_non_json_body(self):
+        with self.assertRaises(requests.exceptions.JSONDecodeError) as cm:
+            self._get_station(b"<html>Bad gateway</html>")
+        self.assertIsInstance(cm.exception, requests.RequestException)
+
+    def test_raises_request_exception_on_empty_body(self):
+        with self.assertRaises(requests.exceptions.JSONDecodeError):
+            self._get_station(b"")
+
+    def test_raises_request_exception_on_invalid_utf8(self):
+        with self.assertRaises(requests.exceptions.JSONDecodeError):
+            self._get_station(b'{"name": "\xff"}')
+
+    @skipUnless(orjson, "orjson is not installed")
+    def test_uses_orjson_if_installed(self):
+        self.assertIs(enhydris_api_client.json_loads, orjson.loads)
+
+    def test_falls_back_to_json_without_orjson(self):
+        with mock.patch.dict(sys.modules, {"orjson": None}):
+            module = importlib.reload(enhydris_api_client)
+        self.addCleanup(importlib.reload, enhydris_api_client)
+        self.assertIs(module.json_loads, json.loads)
+        self.assertEqual(
+            self._get_station(b'{"hello": "world"}', module), {"hello": "world"}
+        )
+        with self.assertRaises(requests.exceptions.JSONDecodeError):
+            self._get_station(b"<html>Bad gateway</html>", module)
+
+
+class ChangeBaseUrlTestCase(TestCase):
+    @mock_session(**{"get.return_value.content": b"{}"})
+    def test_uses_new_base_url(self, mock_requests_session):
+        client = EnhydrisApiClient("https://mydomain.com/")
+        client.base_url = "https://otherdomain.com/"
+        client.get_station(42)
+        mock_requests_session.return_value.get.assert_called_once_with(
+            "https://otherdomain.com/api/stations/42/"
+        )
+
+
 class Error400TestCase(TestCase):
     msg = "hello world"
 
@@ -8,7 +8,7 @@ from . import mock_session
 
 
 class GetStationTestCase(TestCase):
-    @mock_session(**{"get.return_value.json.return_value": {"hello": "world"}})
+    @mock_session(**{"get.return_value.content": b'{"hello": "world"}'})
     def setUp(self, mock_requests_session):
         self.mock_requests_session = mock_requests_session
         self.client = EnhydrisApiClient("https://mydomain.com")
@@ -24,7 +24,7 @@ class GetStationTestCase(TestCase):
 
 
 class PostStationTestCase(TestCase):
-    @mock_session(**{"post.return_value.json.return_value": {"id": 42}})
+    @mock_session(**{"post.return_value.content": b'{"id": 42}'})
     def setUp(self, mock_requests_session):
         self.mock_requests_session = mock_requests_session
         self.client = EnhydrisApiClient("https://mydomain.com")
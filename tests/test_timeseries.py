@@ -8,9 +8,7 @@ from . import mock_session
 
 
 class ListTimeseriesTestCase(TestCase):
-    @mock_session(
-        **{"get.return_value.json.return_value": {"results": [{"hello": "world"}]}}
-    )
+    @mock_session(**{"get.return_value.content": b'{"results": [{"hello": "world"}]}'})
     def setUp(self, mock_requests_session):
         self.mock_requests_session = mock_requests_session
         self.client = EnhydrisApiClient("https://mydomain.com")
@@ -26,7 +24,7 @@ class ListTimeseriesTestCase(TestCase):
 
 
 class GetTimeseriesTestCase(TestCase):
-    @mock_session(**{"get.return_value.json.return_value": {"hello": "world"}})
+    @mock_session(**{"get.return_value.content": b'{"hello": "world"}'})
     def setUp(self, mock_requests_session):
         self.mock_requests_session = mock_requests_session
         self.client = EnhydrisApiClient("https://mydomain.com")
@@ -56,7 +54,7 @@ class GetStationOrTimeseriesErrorTestCase(TestCase):
 
 
 class PostTimeseriesTestCase(TestCase):
-    @mock_session(**{"post.return_value.json.return_value": {"id": 43}})
+    @mock_session(**{"post.return_value.content": b'{"id": 43}'})
     def setUp(self, mock_requests_session):
         self.mock_requests_session = mock_requests_session
         self.client = EnhydrisApiClient("https://mydomain.com")
@@ -8,7 +8,7 @@ from . import mock_session
 
 
 class GetTimeseriesGroupTestCase(TestCase):
-    @mock_session(**{"get.return_value.json.return_value": {"hello": "world"}})
+    @mock_session(**{"get.return_value.content": b'{"hello": "world"}'})
     def setUp(self, mock_requests_session):
         self.mock_requests_session = mock_requests_session
         self.client = EnhydrisApiClient("https://mydomain.com")
@@ -24,7 +24,7 @@ class GetTimeseriesGroupTestCase(TestCase):
 
 
 class PostTimeseriesGroupTestCase(TestCase):
-    @mock_session(**{"post.return_value.json.return_value": {"id": 43}})
+    @mock_session(**{"post.return_value.content": b'{"id": 43}'})
     def setUp(self, mock_requests_session):
         self.mock_requests_session = mock_requests_session
         self.client = EnhydrisApiClient("https://mydomain.com")
@@ -41,7 +41,7 @@ class PostTimeseriesGroupTestCase(TestCase):
 
 
 class PutTimeseriesGroupTestCase(TestCase):
-    @mock_session()
+    @mock_session(**{"put.return_value.content": b'{"id": 43}'})
     def setUp(self, mock_requests_session):
         self.mock_requests_session = mock_requests_session
         self.client = EnhydrisApiClient("https://mydomain.com")
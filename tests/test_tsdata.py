@@ -1,6 +1,4 @@
 import datetime as dt
-from copy import copy
-from io import StringIO
 from unittest import TestCase
 
 import requests
@@ -17,9 +15,11 @@ from . import (
 )
 
 TEST_TIMESERIES_HTS = f"Timezone=+0200\r\n\r\n{test_timeseries_csv}"
+TEST_TIMESERIES_DATA_UTC = test_timeseries_htimeseries.data.tz_convert("UTC")
+TEST_TIMESERIES_RECORDS_UTC = TEST_TIMESERIES_DATA_UTC.to_csv(header=False)
 
 
-@mock_session(**{"get.return_value.text": TEST_TIMESERIES_HTS})
+@mock_session(**{"get.return_value.content": TEST_TIMESERIES_HTS.encode()})
 class ReadTsDataTestCase(TestCase, AssertFrameEqualMixin):
     url = "http://example.com/api/stations/41/timeseriesgroups/42/timeseries/43/data/"
 
@@ -57,7 +57,7 @@ class ReadTsDataTestCase(TestCase, AssertFrameEqualMixin):
 
 
 class ReadTsDataWithStartAndEndDateTestCase(TestCase, AssertFrameEqualMixin):
-    @mock_session(**{"get.return_value.text": TEST_TIMESERIES_HTS})
+    @mock_session(**{"get.return_value.content": TEST_TIMESERIES_HTS.encode()})
     def setUp(self, mock_requests_session):
         self.mock_requests_session = mock_requests_session
         self.client = EnhydrisApiClient("https://mydomain.com")
@@ -98,13 +98,50 @@ class ReadTsDataWithStartAndEndDateTestCase(TestCase, AssertFrameEqualMixin):
 
 
 class ReadEmptyTsDataTestCase(TestCase, AssertFrameEqualMixin):
-    @mock_session(**{"get.return_value.text": ""})
+    @mock_session(**{"get.return_value.content": b""})
     def test_returns_data(self, mock_requests_session):
         self.client = EnhydrisApiClient("https://mydomain.com")
         self.data = self.client.read_tsdata(41, 42, 43)
         self.assert_frame_equal(self.data.data, HTimeseries().data)
 
 
+class ReadNonAsciiTsDataTestCase(TestCase):
+    @mock_session(
+        **{
+            "get.return_value.content": (
+                f"Comment=Πάρνηθα\r\n{TEST_TIMESERIES_HTS}"
+            ).encode("utf-8")
+        }
+    )
+    def test_decodes_utf8(self, mock_requests_session):
+        self.client = EnhydrisApiClient("https://mydomain.com")
+        self.data = self.client.read_tsdata(41, 42, 43)
+        self.assertEqual(self.data.comment, "Πάρνηθα")
+
+
+class ReadTsDataWithBomTestCase(TestCase, AssertFrameEqualMixin):
+    @mock_session(
+        **{"get.return_value.content": b"\xef\xbb\xbf" + TEST_TIMESERIES_HTS.encode()}
+    )
+    def test_returns_data(self, mock_requests_session):
+        self.client = EnhydrisApiClient("https://mydomain.com")
+        self.data = self.client.read_tsdata(41, 42, 43)
+        self.assert_frame_equal(self.data.data, test_timeseries_htimeseries.data)
+
+
+class ReadTsDataWithInvalidUtf8TestCase(TestCase):
+    @mock_session(
+        **{
+            "get.return_value.content": b"Comment=x\xffy\r\n"
+            + TEST_TIMESERIES_HTS.encode()
+        }
+    )
+    def test_replaces_invalid_bytes(self, mock_requests_session):
+        self.client = EnhydrisApiClient("https://mydomain.com")
+        self.data = self.client.read_tsdata(41, 42, 43)
+        self.assertEqual(self.data.comment, "x\ufffdy")
+
+
 class ReadTsDataErrorTestCase(TestCase):
     @mock_session(**{"get.return_value.status_code": 404})
     def test_raises_exception_on_error(self, mock_requests_session):
@@ -118,14 +155,22 @@ class PostTsDataTestCase(TestCase):
     def test_makes_request(self, mock_requests_session):
         client = EnhydrisApiClient("https://mydomain.com")
         client.post_tsdata(41, 42, 43, test_timeseries_htimeseries)
-        f = StringIO()
-        data = copy(test_timeseries_htimeseries.data)
-        data.index = data.index.tz_convert("UTC")
-        data.to_csv(f, header=False)
         mock_requests_session.return_value.post.assert_called_once_with(
             "https://mydomain.com/api/stations/41/timeseriesgroups/42/timeseries/43/"
             "data/",
-            data={"timeseries_records": f.getvalue(), "timezone": "UTC"},
+            files={
+                "timeseries_records": (None, TEST_TIMESERIES_RECORDS_UTC),
+                "timezone": (None, "UTC"),
+            },
+        )
+
+    @mock_session()
+    def test_does_not_modify_timeseries(self, mock_requests_session):
+        client = EnhydrisApiClient("https://mydomain.com")
+        client.post_tsdata(41, 42, 43, test_timeseries_htimeseries)
+        self.assertEqual(
+            test_timeseries_htimeseries.data.index.tz.utcoffset(None),
+            dt.timedelta(hours=2),
         )
 
     @mock_session(**{"post.return_value.status_code": 404})